@@ -0,0 +1,41 @@
+"""
+Быстрый JSON для парсера и сервера
+Использует orjson или ujson, если они установлены, иначе стандартный json
+"""
+
+try:
+    import orjson as _orjson
+
+    def loads(data):
+        """Разбирает JSON из строки или байтов"""
+        return _orjson.loads(data)
+
+    def dumps(obj) -> str:
+        """Сериализует объект в JSON строку"""
+        return _orjson.dumps(obj).decode('utf-8')
+
+    JSONDecodeError = _orjson.JSONDecodeError
+    IMPLEMENTATION = "orjson"
+
+except ImportError:
+    try:
+        import ujson as _ujson
+
+        def loads(data):
+            """Разбирает JSON из строки или байтов"""
+            return _ujson.loads(data)
+
+        def dumps(obj) -> str:
+            """Сериализует объект в JSON строку"""
+            return _ujson.dumps(obj)
+
+        JSONDecodeError = ValueError
+        IMPLEMENTATION = "ujson"
+
+    except ImportError:
+        import json as _json
+
+        loads = _json.loads
+        dumps = _json.dumps
+        JSONDecodeError = _json.JSONDecodeError
+        IMPLEMENTATION = "json"
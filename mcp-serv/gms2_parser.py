@@ -3,46 +3,164 @@ GameMaker Studio 2 Project Parser Module
 Извлеченная логика парсинга из оригинального скрипта vibe2gml
 """
 
+import mmap
 import os
-import json
 import re
-from collections import Counter
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional, Any
 
+# Быстрый JSON (orjson/ujson при наличии, иначе стандартный json)
+import fast_json
+
+# Файлы крупнее этого порога читаем через mmap, а не в кучу целиком
+_MMAP_THRESHOLD = 64 * 1024
+
+# Максимум потоков для параллельного сканирования категорий
+_SCAN_WORKERS = 8
+
+# Сколько файлов экспорт держит "в полёте" при предзагрузке
+_PREFETCH_WINDOW = 32
+
+# Лишние запятые перед ] или } в .yy файлах (lookahead — замена пустой строкой)
+_TRAILING_COMMA_RE = re.compile(r",\s*(?=[\]\}])")
+
+# Разделители экспорта: собираются один раз, а не в цикле на каждый файл
+_SEP_70 = "=" * 70
+_END_GML = "-" * 50 + "[End GML]" + "-" * 19
+_END_YY = "=" * 30 + "[End YY]" + "=" * 32
+
+
+@dataclass(slots=True)
+class GMLEntry:
+    """Найденный при сканировании GML файл и его связанный .yy файл
+
+    slots=True: без __dict__ на экземпляр, а доступ по именованным полям
+    вместо распаковки кортежа в циклах экспорта.
+    """
+    display_name: str
+    file_path: str
+    relative_path: str
+    asset_yy_path: Optional[str]
+
+
+def _read_file_text(path: str):
+    """Читает файл как текст; при ошибке возвращает само исключение
+
+    Файл читается в бинарном режиме и декодируется одним вызовом: это
+    обходит TextIOWrapper с его инкрементальным декодером и трансляцией
+    переводов строк, которые не нужны для сквозного экспорта.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8')
+    except Exception as e:
+        return e
+
 
 class GMS2ProjectParser:
     """Парсер для проектов GameMaker Studio 2"""
-    
+
+    # Категории ассетов: (отображаемое имя, имя папки); кортеж пар
+    # сохраняет канонический порядок вывода
+    _ASSET_CATEGORIES = (
+        ("Objects", "objects"),
+        ("Scripts", "scripts"),
+        ("Rooms", "rooms"),
+        ("Sprites", "sprites"),
+        ("Notes", "notes"),
+        ("Tile Sets", "tilesets"),
+        ("Timelines", "timelines"),
+        ("Fonts", "fonts"),
+        ("Sounds", "sounds"),
+        ("Extensions", "extensions"),
+    )
+
+    # Обратная таблица: имя папки -> отображаемое имя категории
+    _FOLDER_TO_DISPLAY = {folder: display for display, folder in _ASSET_CATEGORIES}
+
+    # Служебные папки верхнего уровня, в которых нет GML ассетов
+    _SKIP_TOP_DIRS = frozenset({'options', 'datafiles', 'configs', '.git', '.vscode', 'temp'})
+
+    # Максимум закэшированных разобранных .yy файлов (комнаты и объекты)
+    _YY_CACHE_SIZE = 128
+
+
     def __init__(self, project_path: str):
         self.project_path = project_path
-        self.project_gml_files_details = []  # (display_name, gml_path, relative_path, asset_yy_path)
-        
-    def scan_project(self) -> Dict[str, Any]:
-        """Сканирует проект и возвращает структуру файлов"""
+        self.project_gml_files_details: List[GMLEntry] = []
+        # Кэш полного scan_project внутри парсера: экспорт и повторные
+        # сканы не обходят дерево заново, пока .yyp файл не изменился
+        self._scan_cache: Optional[Dict[str, Any]] = None
+        self._scan_mtime: float = 0.0
+        # Префикс корня с разделителем: относительный путь получается
+        # срезом строки вместо os.path.relpath на каждый файл
+        self._root_prefix = os.path.join(project_path, '')
+        # Кэш разобранных .yy файлов: (путь, mtime_ns, размер) -> результат
+        self._yy_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        # Полный скан мутирует общий project_gml_files_details, а один
+        # парсер делят конкурентные запросы из пула потоков — замок
+        # гарантирует, что холодный обход выполняется ровно один раз
+        self._scan_lock = threading.Lock()
+
+    def _yyp_mtime(self) -> float:
+        """Возвращает mtime .yyp файла проекта (0.0, если файла нет)"""
+        try:
+            mtimes = [
+                os.path.getmtime(os.path.join(self.project_path, f))
+                for f in os.listdir(self.project_path) if f.endswith('.yyp')
+            ]
+        except OSError:
+            return 0.0
+        return max(mtimes, default=0.0)
+
+    def invalidate(self):
+        """Сбрасывает кэши парсера (например после правки проекта)"""
+        with self._scan_lock:
+            self._scan_cache = None
+            self._scan_mtime = 0.0
+            self.project_gml_files_details.clear()
+            self._yy_cache.clear()
+
+    def _cached_yy(self, yy_path: str, fetch_fn) -> Dict[str, Any]:
+        """Возвращает результат fetch_fn, кэшируя его по mtime и размеру файла
+
+        Повторные запросы той же комнаты/объекта не перечитывают, не
+        парсят и не переформатируют .yy файл, пока он не изменился.
+        """
+        try:
+            st = os.stat(yy_path)
+        except OSError:
+            return fetch_fn()
+        key = (yy_path, st.st_mtime_ns, st.st_size)
+        cached = self._yy_cache.get(key)
+        if cached is not None:
+            self._yy_cache.move_to_end(key)
+            return cached
+        result = fetch_fn()
+        if "error" not in result:
+            self._yy_cache[key] = result
+            if len(self._yy_cache) > self._YY_CACHE_SIZE:
+                self._yy_cache.popitem(last=False)
+        return result
+
+    def scan_project(self, include: Optional[frozenset] = None) -> Dict[str, Any]:
+        """Сканирует проект и возвращает структуру файлов
+
+        include — множество имён категорий (например {"Scripts"}): тогда
+        сканируются только эти категории и пропускается обход GML файлов.
+        None означает полное сканирование.
+        """
         if not os.path.exists(self.project_path):
             return {"error": f"Project path not found: {self.project_path}"}
-            
+
         # Проверяем наличие .yyp файла
         yyp_files = [f for f in os.listdir(self.project_path) if f.endswith('.yyp')]
         if not yyp_files:
             return {"error": f"No .yyp file found in {self.project_path}"}
-            
-        self.project_gml_files_details.clear()
-        
-        # Категории ассетов
-        asset_categories = {
-            "Objects": "objects",
-            "Scripts": "scripts", 
-            "Rooms": "rooms",
-            "Sprites": "sprites",
-            "Notes": "notes",
-            "Tile Sets": "tilesets",
-            "Timelines": "timelines",
-            "Fonts": "fonts",
-            "Sounds": "sounds",
-            "Extensions": "extensions"
-        }
-        
+
         structure = {
             "project_name": os.path.basename(self.project_path),
             "project_path": self.project_path,
@@ -51,18 +169,199 @@ class GMS2ProjectParser:
             "total_gml_files": 0
         }
         
-        # Сканируем каждую категорию
-        for display_name, folder_name in asset_categories.items():
-            category_path = os.path.join(self.project_path, folder_name)
-            if os.path.isdir(category_path):
-                structure["categories"][display_name] = self._scan_category(category_path, display_name)
-                
-        # Сканируем GML файлы
-        self._scan_gml_files()
-        structure["gml_files"] = self.project_gml_files_details
-        structure["total_gml_files"] = len(self.project_gml_files_details)
-        
+        if include is not None:
+            # Частичный скан: только запрошенные категории, параллельно.
+            # Работа чисто I/O-bound (readdir/stat), GIL отпускается на
+            # syscall'ах, порядок результатов сохраняется через executor.map.
+            # Папки категорий ищутся одним scandir корня вместо isdir на каждую
+            try:
+                with os.scandir(self.project_path) as it:
+                    top_dirs = {entry.name: entry.path for entry in it
+                                if entry.is_dir(follow_symlinks=False)}
+            except OSError:
+                top_dirs = {}
+            category_paths = [
+                (display_name, top_dirs[folder_name])
+                for display_name, folder_name in self._ASSET_CATEGORIES
+                if display_name in include and folder_name in top_dirs
+            ]
+
+            if category_paths:
+                with ThreadPoolExecutor(max_workers=min(_SCAN_WORKERS, len(category_paths))) as executor:
+                    scanned = executor.map(
+                        lambda item: self._scan_category(item[1], item[0]),
+                        category_paths
+                    )
+                    for (display_name, _), category_info in zip(category_paths, scanned):
+                        structure["categories"][display_name] = category_info
+            return structure
+
+        # Полный скан: категории и GML файлы за один обход дерева.
+        # Под замком, потому что он чистит и заполняет общий список
+        # project_gml_files_details: конкурентные холодные сканы иначе
+        # дублируют записи. Кэш проверяется уже под замком — опоздавшие
+        # запросы получают готовый результат, а не второй обход.
+        with self._scan_lock:
+            yyp_mtime = self._yyp_mtime()
+            if self._scan_cache is not None and self._scan_mtime == yyp_mtime:
+                return self._scan_cache
+            self.project_gml_files_details.clear()
+
+            found = self._scan_everything()
+            for display_name, _ in self._ASSET_CATEGORIES:
+                category_info = found.get(display_name)
+                if category_info is not None:
+                    structure["categories"][display_name] = category_info
+            structure["gml_files"] = self.project_gml_files_details
+            structure["total_gml_files"] = len(self.project_gml_files_details)
+            self._scan_cache = structure
+            self._scan_mtime = yyp_mtime
+
         return structure
+
+    def _emit_gml_entries(self, dir_path: str, file_entries: List[os.DirEntry]):
+        """Добавляет GMLEntry для .gml файлов одного каталога
+
+        Наличие одноимённого .yy файла определяется по самому листингу
+        каталога — без дополнительного stat на каждый GML файл.
+        """
+        dir_name = dir_path.rpartition(os.sep)[2]
+        yy_name = f"{dir_name}.yy"
+        yy_path = None
+        for entry in file_entries:
+            if entry.name == yy_name:
+                yy_path = entry.path
+                break
+        out = self.project_gml_files_details
+        prefix = self._root_prefix
+        prefix_len = len(prefix)
+        for entry in file_entries:
+            name = entry.name
+            if name.endswith('.gml'):
+                path = entry.path
+                # Пути приходят из scandir от корня проекта — относительный
+                # путь получается срезом, без os.path.relpath на каждый файл
+                relative_path = path[prefix_len:] if path.startswith(prefix) \
+                    else os.path.relpath(path, self.project_path)
+                gml_name = name[:-4]  # отрезаем известный суффикс '.gml'
+                out.append(GMLEntry(f"{dir_name} / {gml_name}", path,
+                                    relative_path, yy_path))
+
+    def _walk_tree(self, dir_path: str):
+        """Рекурсивно собирает GML файлы каталога (вне категорий ассетов)"""
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+        files = [e for e in entries if not e.is_dir(follow_symlinks=False)]
+        self._emit_gml_entries(dir_path, files)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                self._walk_tree(entry.path)
+
+    def _scan_category_collect(self, category_path: str, category_name: str) -> Dict[str, Any]:
+        """Сканирует категорию, попутно собирая её GML файлы
+
+        Тот же формат результата, что у _scan_category, но каждая папка
+        читается один раз и на оба индекса (категории и список GML).
+        """
+        category_info = {
+            "path": category_path,
+            "assets": []
+        }
+
+        asset_type = category_name.lower().rstrip('s')  # objects -> object
+        try:
+            with os.scandir(category_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            category_info["error"] = f"Could not read directory: {e}"
+            entries = []
+
+        # GML файлы прямо в папке категории (нетипично, но walk их находил)
+        top_files = [e for e in entries if not e.is_dir(follow_symlinks=False)]
+        self._emit_gml_entries(category_path, top_files)
+
+        for asset_entry in entries:
+            if not asset_entry.is_dir(follow_symlinks=False):
+                continue
+            asset_name = asset_entry.name
+            asset_info = {
+                "name": asset_name,
+                "path": asset_entry.path,
+                "type": asset_type,
+                "yy_file": None,
+                "gml_files": []
+            }
+
+            try:
+                with os.scandir(asset_entry.path) as files_it:
+                    asset_entries = sorted(files_it, key=lambda entry: entry.name)
+            except OSError:
+                asset_entries = []
+
+            yy_name = f"{asset_name}.yy"
+            asset_files = []
+            for file_entry in asset_entries:
+                if file_entry.is_dir(follow_symlinks=False):
+                    continue
+                asset_files.append(file_entry)
+                file_name = file_entry.name
+                if file_name == yy_name:
+                    asset_info["yy_file"] = file_entry.path
+                elif file_name.endswith('.gml'):
+                    asset_info["gml_files"].append({
+                        "name": file_name,
+                        "path": file_entry.path
+                    })
+
+            self._emit_gml_entries(asset_entry.path, asset_files)
+            for file_entry in asset_entries:
+                if file_entry.is_dir(follow_symlinks=False):
+                    self._walk_tree(file_entry.path)
+
+            category_info["assets"].append(asset_info)
+
+        # SoA-представление для циклов форматирования: параллельные списки
+        # вместо словарного обращения на каждое поле каждого ассета
+        assets = category_info["assets"]
+        category_info["names"] = [a["name"] for a in assets]
+        category_info["gml_counts"] = [len(a["gml_files"]) for a in assets]
+        category_info["yy_flags"] = [a["yy_file"] is not None for a in assets]
+
+        return category_info
+
+    def _scan_everything(self) -> Dict[str, Dict[str, Any]]:
+        """Один обход дерева: индекс категорий и список GML файлов
+
+        Раньше полный скан читал каждую папку категории дважды — один раз
+        для индекса ассетов, второй раз при обходе GML файлов. Здесь оба
+        результата собираются за один проход.
+        """
+        folder_to_display = self._FOLDER_TO_DISPLAY
+        skip_dirs = self._SKIP_TOP_DIRS
+        found: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            with os.scandir(self.project_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return found
+
+        root_files = [e for e in entries if not e.is_dir(follow_symlinks=False)]
+        self._emit_gml_entries(self.project_path, root_files)
+
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            display_name = folder_to_display.get(entry.name)
+            if display_name is not None:
+                found[display_name] = self._scan_category_collect(entry.path, display_name)
+            elif entry.name.lower() not in skip_dirs:
+                self._walk_tree(entry.path)
+
+        return found
     
     def _scan_category(self, category_path: str, category_name: str) -> Dict[str, Any]:
         """Сканирует категорию ассетов"""
@@ -71,86 +370,74 @@ class GMS2ProjectParser:
             "assets": []
         }
         
+        asset_type = category_name.lower().rstrip('s')  # objects -> object
         try:
-            for asset_name in sorted(os.listdir(category_path)):
-                asset_path = os.path.join(category_path, asset_name)
-                if os.path.isdir(asset_path):
-                    asset_info = {
-                        "name": asset_name,
-                        "path": asset_path,
-                        "type": category_name.lower().rstrip('s'),  # objects -> object
-                        "yy_file": None,
-                        "gml_files": []
-                    }
-                    
-                    # Ищем .yy файл
-                    yy_path = os.path.join(asset_path, f"{asset_name}.yy")
-                    if os.path.isfile(yy_path):
-                        asset_info["yy_file"] = yy_path
-                        
-                    # Ищем .gml файлы
-                    for file in os.listdir(asset_path):
-                        if file.endswith('.gml'):
-                            gml_path = os.path.join(asset_path, file)
+            # scandir отдаёт тип записи из readdir — без stat на каждый элемент
+            with os.scandir(category_path) as it:
+                asset_dirs = sorted(
+                    (entry for entry in it if entry.is_dir(follow_symlinks=False)),
+                    key=lambda entry: entry.name
+                )
+            for asset_entry in asset_dirs:
+                asset_name = asset_entry.name
+                asset_info = {
+                    "name": asset_name,
+                    "path": asset_entry.path,
+                    "type": asset_type,
+                    "yy_file": None,
+                    "gml_files": []
+                }
+
+                # Один проход по папке ассета: и .yy файл, и .gml файлы
+                yy_name = f"{asset_name}.yy"
+                with os.scandir(asset_entry.path) as files_it:
+                    for file_entry in files_it:
+                        file_name = file_entry.name
+                        if file_name == yy_name and file_entry.is_file(follow_symlinks=False):
+                            asset_info["yy_file"] = file_entry.path
+                        elif file_name.endswith('.gml'):
                             asset_info["gml_files"].append({
-                                "name": file,
-                                "path": gml_path
+                                "name": file_name,
+                                "path": file_entry.path
                             })
-                            
-                    category_info["assets"].append(asset_info)
-                    
+
+                category_info["assets"].append(asset_info)
+
         except OSError as e:
             category_info["error"] = f"Could not read directory: {e}"
-            
+
+        # SoA-представление для циклов форматирования: параллельные списки
+        # вместо словарного обращения на каждое поле каждого ассета
+        assets = category_info["assets"]
+        category_info["names"] = [a["name"] for a in assets]
+        category_info["gml_counts"] = [len(a["gml_files"]) for a in assets]
+        category_info["yy_flags"] = [a["yy_file"] is not None for a in assets]
+
         return category_info
     
-    def _scan_gml_files(self):
-        """Сканирует все GML файлы в проекте"""
-        for root, dirs, files in os.walk(self.project_path):
-            # Пропускаем системные папки
-            relative_root = os.path.relpath(root, self.project_path)
-            if relative_root != '.':
-                top_dir = relative_root.split(os.sep)[0].lower()
-                if top_dir in ['options', 'datafiles', 'configs', '.git', '.vscode', 'temp']:
-                    dirs[:] = []
-                    continue
-                    
-            for file in sorted(files):
-                if file.endswith('.gml'):
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, self.project_path)
-                    parent_dir = os.path.dirname(file_path)
-                    
-                    # Определяем связанный .yy файл
-                    asset_yy_path = None
-                    asset_name = os.path.basename(parent_dir)
-                    potential_yy_path = os.path.join(parent_dir, f"{asset_name}.yy")
-                    if os.path.isfile(potential_yy_path):
-                        asset_yy_path = potential_yy_path
-                        
-                    # Определяем display name
-                    parent_asset_name = os.path.basename(parent_dir)
-                    gml_name = os.path.splitext(file)[0]
-                    display_name = f"{parent_asset_name} / {gml_name}"
-                    
-                    self.project_gml_files_details.append((
-                        display_name, file_path, relative_path, asset_yy_path
-                    ))
-    
     def get_gml_content(self, file_path: str) -> Dict[str, Any]:
         """Получает содержимое GML файла"""
         try:
             if not os.path.isfile(file_path):
                 return {"error": f"File not found: {file_path}"}
-                
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
+
+            # Читаем файл как байты: подсчёт строк через count(b'\n') —
+            # это один C-цикл по памяти вместо построения списка строк
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size >= _MMAP_THRESHOLD:
+                    # Большие файлы забираем через mmap одним копированием
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        data = bytes(mm)
+                else:
+                    data = f.read()
+            line_count = data.count(b'\n') + (0 if not data or data.endswith(b'\n') else 1)
+
             return {
                 "file_path": file_path,
                 "relative_path": os.path.relpath(file_path, self.project_path),
-                "content": content,
-                "line_count": len(content.splitlines())
+                "content": data.decode('utf-8'),
+                "line_count": line_count
             }
         except Exception as e:
             return {"error": f"Error reading file {file_path}: {e}"}
@@ -162,14 +449,21 @@ class GMS2ProjectParser:
         
         if not os.path.isfile(room_yy_path):
             return {"error": f"Room .yy file not found: {room_yy_path}"}
-            
+
+        return self._cached_yy(
+            room_yy_path,
+            lambda: self._load_room_info(room_name, room_path, room_yy_path))
+
+    def _load_room_info(self, room_name: str, room_path: str,
+                        room_yy_path: str) -> Dict[str, Any]:
+        """Читает, парсит и форматирует .yy файл комнаты (без кэша)"""
         try:
             with open(room_yy_path, 'r', encoding='utf-8') as f:
                 content = f.read()
                 
             # Очищаем JSON от лишних запятых
-            content_cleaned = re.sub(r",\s*([]}])", r"\1", content)
-            room_data = json.loads(content_cleaned)
+            content_cleaned = _TRAILING_COMMA_RE.sub("", content)
+            room_data = fast_json.loads(content_cleaned)
             
             return {
                 "room_name": room_name,
@@ -178,7 +472,7 @@ class GMS2ProjectParser:
                 "data": room_data,
                 "formatted_info": self._format_room_data(room_data)
             }
-        except json.JSONDecodeError as e:
+        except fast_json.JSONDecodeError as e:
             return {"error": f"Error parsing room JSON: {e}"}
         except Exception as e:
             return {"error": f"Error reading room file: {e}"}
@@ -190,14 +484,21 @@ class GMS2ProjectParser:
         
         if not os.path.isfile(object_yy_path):
             return {"error": f"Object .yy file not found: {object_yy_path}"}
-            
+
+        return self._cached_yy(
+            object_yy_path,
+            lambda: self._load_object_info(object_name, object_path, object_yy_path))
+
+    def _load_object_info(self, object_name: str, object_path: str,
+                          object_yy_path: str) -> Dict[str, Any]:
+        """Читает, парсит и форматирует .yy файл объекта (без кэша)"""
         try:
             with open(object_yy_path, 'r', encoding='utf-8') as f:
                 content = f.read()
                 
             # Очищаем JSON от лишних запятых
-            content_cleaned = re.sub(r",\s*([]}])", r"\1", content)
-            object_data = json.loads(content_cleaned)
+            content_cleaned = _TRAILING_COMMA_RE.sub("", content)
+            object_data = fast_json.loads(content_cleaned)
             
             return {
                 "object_name": object_name,
@@ -206,7 +507,7 @@ class GMS2ProjectParser:
                 "data": object_data,
                 "formatted_info": self._format_object_data(object_data)
             }
-        except json.JSONDecodeError as e:
+        except fast_json.JSONDecodeError as e:
             return {"error": f"Error parsing object JSON: {e}"}
         except Exception as e:
             return {"error": f"Error reading object file: {e}"}
@@ -226,72 +527,138 @@ class GMS2ProjectParser:
             "frames": []
         }
         
-        # Ищем PNG файлы (кадры спрайта)
+        # Ищем PNG файлы (кадры спрайта): scandir отдаёт готовый entry.path
+        # и тип записи без join и stat на каждый файл
         try:
-            for filename in sorted(os.listdir(sprite_path)):
-                if filename.lower().endswith('.png'):
-                    sprite_info["frames"].append({
-                        "filename": filename,
-                        "path": os.path.join(sprite_path, filename)
-                    })
+            with os.scandir(sprite_path) as it:
+                png_entries = sorted(
+                    (entry for entry in it
+                     if entry.name.lower().endswith('.png')
+                     and entry.is_file(follow_symlinks=False)),
+                    key=lambda entry: entry.name
+                )
+            sprite_info["frames"] = [
+                {"filename": entry.name, "path": entry.path}
+                for entry in png_entries
+            ]
         except OSError as e:
             sprite_info["error"] = f"Error reading sprite folder: {e}"
             
         return sprite_info
     
-    def export_all_data(self) -> str:
-        """Экспортирует все данные проекта в текстовый формат"""
+    def _iter_file_contents(self, paths: List[str]):
+        """Читает файлы в пуле потоков, отдавая содержимое в исходном порядке
+
+        Держит не больше _PREFETCH_WINDOW чтений в полёте: диск загружен
+        параллельными запросами, а память ограничена размером окна.
+        Ошибки чтения возвращаются как объекты исключений.
+        """
+        paths_iter = iter(paths)
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as executor:
+            pending = deque()
+            for path in paths_iter:
+                pending.append(executor.submit(_read_file_text, path))
+                if len(pending) >= _PREFETCH_WINDOW:
+                    break
+            while pending:
+                future = pending.popleft()
+                next_path = next(paths_iter, None)
+                if next_path is not None:
+                    pending.append(executor.submit(_read_file_text, next_path))
+                yield future.result()
+
+    def iter_export_chunks(self):
+        """Генерирует экспорт данных проекта по частям (файл за файлом)
+
+        Позволяет записывать экспорт в файл потоково, не собирая весь
+        текст в памяти; содержимое файлов предзагружается параллельно.
+        """
         if not self.project_gml_files_details:
             self.scan_project()
-            
-        output_lines = []
-        output_lines.append(f"// GML and YY Data Export from Project: {self.project_path}")
-        output_lines.append(f"// Total GML Files Found: {len(self.project_gml_files_details)}")
-        output_lines.append("=" * 70)
-        output_lines.append("")
-        
+
+        details = list(self.project_gml_files_details)
+
+        header_lines = [
+            f"// GML and YY Data Export from Project: {self.project_path}",
+            f"// Total GML Files Found: {len(details)}",
+            _SEP_70,
+            ""
+        ]
+        yield "\n".join(header_lines) + "\n"
+
+        # План чтения: GML файлы вперемешку с их .yy (каждый .yy один раз)
+        read_paths = []
+        export_yy_flags = []
         exported_yy_files = set()
-        
-        for display_name, file_path, relative_path, asset_yy_path in self.project_gml_files_details:
+        for entry in details:
+            read_paths.append(entry.file_path)
+            asset_yy_path = entry.asset_yy_path
+            export_yy = (asset_yy_path is not None
+                         and asset_yy_path not in exported_yy_files
+                         and os.path.isfile(asset_yy_path))
+            if export_yy:
+                exported_yy_files.add(asset_yy_path)
+                read_paths.append(asset_yy_path)
+            export_yy_flags.append(export_yy)
+
+        contents = self._iter_file_contents(read_paths)
+
+        for entry, export_yy in zip(details, export_yy_flags):
+            relative_path = entry.relative_path
             # Экспортируем GML файл
-            output_lines.append(f"// ----- Start GML: {display_name} -----")
-            output_lines.append(f"// ----- GML Path: {relative_path} -----")
-            output_lines.append("")
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    output_lines.append(f.read())
-            except Exception as e:
-                output_lines.append(f"// ***** ERROR READING GML FILE: {relative_path} *****")
-                output_lines.append(f"// ***** Error: {e} *****")
-                
-            output_lines.append("")
-            output_lines.append("-" * 50 + "[End GML]" + "-" * 19)
-            output_lines.append("")
-            
+            chunk_lines = []
+            chunk_lines.append(f"// ----- Start GML: {entry.display_name} -----")
+            chunk_lines.append(f"// ----- GML Path: {relative_path} -----")
+            chunk_lines.append("")
+
+            content = next(contents)
+            if isinstance(content, Exception):
+                chunk_lines.append(f"// ***** ERROR READING GML FILE: {relative_path} *****")
+                chunk_lines.append(f"// ***** Error: {content} *****")
+            else:
+                chunk_lines.append(content)
+
+            chunk_lines.append("")
+            chunk_lines.append(_END_GML)
+            chunk_lines.append("")
+            yield "\n".join(chunk_lines) + "\n"
+
             # Экспортируем связанный YY файл
-            if asset_yy_path and os.path.isfile(asset_yy_path) and asset_yy_path not in exported_yy_files:
+            if export_yy:
+                asset_yy_path = entry.asset_yy_path
                 relative_yy_path = os.path.relpath(asset_yy_path, self.project_path)
                 asset_name = os.path.basename(os.path.dirname(asset_yy_path))
-                
-                output_lines.append(f"// ----- Associated YY File: {asset_name} -----")
-                output_lines.append(f"// ----- YY Path: {relative_yy_path} -----")
-                output_lines.append("")
-                
-                try:
-                    with open(asset_yy_path, 'r', encoding='utf-8') as f:
-                        output_lines.append(f.read())
-                except Exception as e:
-                    output_lines.append(f"// ***** ERROR READING YY FILE: {relative_yy_path} *****")
-                    output_lines.append(f"// ***** Error: {e} *****")
-                    
-                output_lines.append("")
-                output_lines.append("=" * 30 + "[End YY]" + "=" * 32)
-                output_lines.append("")
-                
-                exported_yy_files.add(asset_yy_path)
-                
-        return "\n".join(output_lines)
+
+                chunk_lines = []
+                chunk_lines.append(f"// ----- Associated YY File: {asset_name} -----")
+                chunk_lines.append(f"// ----- YY Path: {relative_yy_path} -----")
+                chunk_lines.append("")
+
+                yy_content = next(contents)
+                if isinstance(yy_content, Exception):
+                    chunk_lines.append(f"// ***** ERROR READING YY FILE: {relative_yy_path} *****")
+                    chunk_lines.append(f"// ***** Error: {yy_content} *****")
+                else:
+                    chunk_lines.append(yy_content)
+
+                chunk_lines.append("")
+                chunk_lines.append(_END_YY)
+                chunk_lines.append("")
+                yield "\n".join(chunk_lines) + "\n"
+
+    def export_all_data(self, out=None) -> str:
+        """Экспортирует все данные проекта в текстовый формат
+
+        Если передан файловый объект out, чанки пишутся прямо в него без
+        сборки всего текста в памяти, возвращается пустая строка. Без out
+        возвращается весь экспорт одной строкой, как раньше.
+        """
+        if out is not None:
+            write = out.write
+            for chunk in self.iter_export_chunks():
+                write(chunk)
+            return ""
+        return "".join(self.iter_export_chunks())
     
     def _format_room_data(self, data: Dict[str, Any]) -> str:
         """Форматирует данные комнаты для отображения"""
@@ -319,9 +686,12 @@ class GMS2ProjectParser:
                 
                 if instances:
                     output_lines.append(f"{inst_prefix} Instances ({len(instances)})")
-                    instance_counts = Counter()
+                    # Обычный dict.get быстрее Counter.__missing__ на первом
+                    # вхождении каждого объекта
+                    instance_counts = {}
                     for inst in instances:
-                        instance_counts[inst.get('objId', {}).get('name', 'UnknownObject')] += 1
+                        obj = inst.get('objId', {}).get('name', 'UnknownObject')
+                        instance_counts[obj] = instance_counts.get(obj, 0) + 1
                     
                     sorted_objects = sorted(instance_counts.items())
                     obj_prefix_connector = f"{inst_prefix_connector}    "
@@ -358,64 +728,68 @@ class GMS2ProjectParser:
         return "\n".join(output_lines)
     
     def _format_object_data(self, data: Dict[str, Any]) -> str:
-        """Форматирует данные объекта для отображения"""
-        output_lines = []
+        """Форматирует данные объекта для отображения
+
+        Секции собираются целыми многострочными f-строками вместо
+        десятков отдельных append'ов; итоговый текст идентичен.
+        """
         obj_name = data.get('name', 'Unknown Object')
-        output_lines.append(f"Object: {obj_name}")
-        output_lines.append("=" * (len(obj_name) + 8))
-        
-        # Основные свойства
-        output_lines.append("")
-        output_lines.append("[Properties]")
         sprite_id = data.get('spriteId')
-        output_lines.append(f"  Sprite: {sprite_id.get('name', 'None') if sprite_id else 'None'}")
-        
         mask_id = data.get('spriteMaskId')
-        output_lines.append(f"  Mask: {mask_id.get('name', 'Same as Sprite') if mask_id else 'Same as Sprite'}")
-        
         parent_id = data.get('parentObjectId')
-        output_lines.append(f"  Parent: {parent_id.get('name', 'None') if parent_id else 'None'}")
-        
-        output_lines.append(f"  Visible: {data.get('visible', True)}")
-        output_lines.append(f"  Solid: {data.get('solid', False)}")
-        output_lines.append(f"  Persistent: {data.get('persistent', False)}")
-        
-        # События
         event_list = data.get('eventList', [])
-        output_lines.append(f"")
-        output_lines.append(f"[Events ({len(event_list)})]")
-        
+
+        # Заголовок, основные свойства и события
+        output_blocks = [
+            f"Object: {obj_name}\n"
+            f"{'=' * (len(obj_name) + 8)}\n"
+            "\n"
+            "[Properties]\n"
+            f"  Sprite: {sprite_id.get('name', 'None') if sprite_id else 'None'}\n"
+            f"  Mask: {mask_id.get('name', 'Same as Sprite') if mask_id else 'Same as Sprite'}\n"
+            f"  Parent: {parent_id.get('name', 'None') if parent_id else 'None'}\n"
+            f"  Visible: {data.get('visible', True)}\n"
+            f"  Solid: {data.get('solid', False)}\n"
+            f"  Persistent: {data.get('persistent', False)}\n"
+            "\n"
+            f"[Events ({len(event_list)})]"
+        ]
+
         # Физика
         if data.get('physicsObject', False):
-            output_lines.append("")
-            output_lines.append("[Physics Properties]")
-            output_lines.append(f"  Enabled: True")
-            output_lines.append(f"  Sensor: {data.get('physicsSensor', False)}")
-            output_lines.append(f"  Shape: {data.get('physicsShape', 1)}")
-            output_lines.append(f"  Density: {data.get('physicsDensity', 0.5)}")
-            output_lines.append(f"  Restitution: {data.get('physicsRestitution', 0.1)}")
-            output_lines.append(f"  Group: {data.get('physicsGroup', 1)}")
-            output_lines.append(f"  Linear Damping: {data.get('physicsLinearDamping', 0.1)}")
-            output_lines.append(f"  Angular Damping: {data.get('physicsAngularDamping', 0.1)}")
-            output_lines.append(f"  Friction: {data.get('physicsFriction', 0.2)}")
-            output_lines.append(f"  Awake: {data.get('physicsStartAwake', True)}")
-            output_lines.append(f"  Kinematic: {data.get('physicsKinematic', False)}")
+            output_blocks.append(
+                "\n"
+                "[Physics Properties]\n"
+                "  Enabled: True\n"
+                f"  Sensor: {data.get('physicsSensor', False)}\n"
+                f"  Shape: {data.get('physicsShape', 1)}\n"
+                f"  Density: {data.get('physicsDensity', 0.5)}\n"
+                f"  Restitution: {data.get('physicsRestitution', 0.1)}\n"
+                f"  Group: {data.get('physicsGroup', 1)}\n"
+                f"  Linear Damping: {data.get('physicsLinearDamping', 0.1)}\n"
+                f"  Angular Damping: {data.get('physicsAngularDamping', 0.1)}\n"
+                f"  Friction: {data.get('physicsFriction', 0.2)}\n"
+                f"  Awake: {data.get('physicsStartAwake', True)}\n"
+                f"  Kinematic: {data.get('physicsKinematic', False)}"
+            )
         else:
-            output_lines.append("")
-            output_lines.append("[Physics Properties]")
-            output_lines.append(f"  Enabled: False")
-        
+            output_blocks.append(
+                "\n"
+                "[Physics Properties]\n"
+                "  Enabled: False"
+            )
+
         # Переменные объекта
         obj_props = data.get('properties', [])
-        output_lines.append(f"")
-        output_lines.append(f"[Object Variables ({len(obj_props)})]")
+        output_blocks.append(f"\n[Object Variables ({len(obj_props)})]")
         if obj_props:
-            for prop in obj_props:
-                prop_name = prop.get('name', prop.get('varName', 'UnknownVar'))
-                prop_val = prop.get('value', prop.get('varValue', 'UnknownVal'))
-                prop_type = prop.get('type', prop.get('varType', '?'))
-                output_lines.append(f"  - {prop_name} = {prop_val} (Type: {prop_type})")
+            output_blocks.extend(
+                f"  - {prop.get('name', prop.get('varName', 'UnknownVar'))}"
+                f" = {prop.get('value', prop.get('varValue', 'UnknownVal'))}"
+                f" (Type: {prop.get('type', prop.get('varType', '?'))})"
+                for prop in obj_props
+            )
         else:
-            output_lines.append("  (None)")
-        
-        return "\n".join(output_lines) 
\ No newline at end of file
+            output_blocks.append("  (None)")
+
+        return "\n".join(output_blocks)
\ No newline at end of file
@@ -6,9 +6,13 @@ MCP Server для работы с проектами GameMaker Studio 2
 
 import asyncio
 import argparse
-import json
+import concurrent.futures
+import io
+import logging
 import os
 import sys
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from mcp.server import Server
@@ -19,272 +23,440 @@ from dotenv import load_dotenv
 # Импортируем gms2_parser из локальной папки
 from gms2_parser import GMS2ProjectParser
 
+# Логи идут в stderr: stdout занят протоколом MCP
+logger = logging.getLogger("gms2-mcp")
+
+
+# Путь к config.env рядом с сервером, вычисляется один раз при импорте
+CONFIG_ENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.env')
+
+# Конфигурация из config.env, загружается один раз на процесс
+_CFG: Optional[Dict[str, Optional[str]]] = None
+
+
+def _get_config() -> Dict[str, Optional[str]]:
+    """Загружает config.env один раз и кэширует результат
+
+    Повторные вызовы (в том числе при встраивании сервера в другой
+    процесс) не перечитывают файл и не трогают os.environ.
+    """
+    global _CFG
+    if _CFG is None:
+        load_dotenv(CONFIG_ENV_PATH)
+        _CFG = {'GMS2_PROJECT_PATH': os.environ.get('GMS2_PROJECT_PATH')}
+    return _CFG
+
+
+def _tc(text: str) -> TextContent:
+    """Создаёт TextContent без повторной Pydantic-валидации
+
+    Аргументы известны заранее и корректны, поэтому валидатор можно
+    пропустить через model_construct.
+    """
+    return TextContent.model_construct(type="text", text=text)
+
+
+@lru_cache(maxsize=1024)
+def _resolve_gml_path(project_path: str, file_path: str) -> str:
+    """Разрешает путь к GML файлу относительно проекта (с кэшем)"""
+    if os.path.isabs(file_path):
+        return file_path
+    return os.path.normpath(os.path.join(project_path, file_path))
+
+
+# Общее свойство project_path для схем всех инструментов
+_PROJECT_PATH_PROP = {
+    "type": "string",
+    "description": "Путь к папке проекта GMS2 (необязательно, используется из config.env)"
+}
+
+# Список инструментов неизменяем — строим его один раз при импорте модуля
+_TOOLS: List[Tool] = [
+    Tool(
+        name="scan_gms2_project",
+        description="Сканирует проект GameMaker Studio 2 и возвращает структуру файлов",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_path": _PROJECT_PATH_PROP
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="get_gml_file_content",
+        description="Получает содержимое конкретного GML файла",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_path": _PROJECT_PATH_PROP,
+                "file_path": {
+                    "type": "string",
+                    "description": "Путь к GML файлу (относительный или абсолютный)"
+                }
+            },
+            "required": ["file_path"]
+        }
+    ),
+    Tool(
+        name="get_room_info",
+        description="Получает детальную информацию о комнате из .yy файла",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_path": _PROJECT_PATH_PROP,
+                "room_name": {
+                    "type": "string",
+                    "description": "Имя комнаты"
+                }
+            },
+            "required": ["room_name"]
+        }
+    ),
+    Tool(
+        name="get_object_info",
+        description="Получает детальную информацию об объекте из .yy файла",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_path": _PROJECT_PATH_PROP,
+                "object_name": {
+                    "type": "string",
+                    "description": "Имя объекта"
+                }
+            },
+            "required": ["object_name"]
+        }
+    ),
+    Tool(
+        name="get_sprite_info",
+        description="Получает информацию о спрайте",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_path": _PROJECT_PATH_PROP,
+                "sprite_name": {
+                    "type": "string",
+                    "description": "Имя спрайта"
+                }
+            },
+            "required": ["sprite_name"]
+        }
+    ),
+    Tool(
+        name="export_project_data",
+        description="Экспортирует все данные проекта в текстовый формат (аналог функции из vibe2gml)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_path": _PROJECT_PATH_PROP,
+                "save_to_file": {
+                    "type": "boolean",
+                    "description": "Сохранить результат в файл (по умолчанию false)",
+                    "default": False
+                },
+                "output_file": {
+                    "type": "string",
+                    "description": "Путь для сохранения файла (если save_to_file=true)"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="list_project_assets",
+        description="Получает список всех ассетов проекта по категориям",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_path": _PROJECT_PATH_PROP,
+                "category": {
+                    "type": "string",
+                    "description": "Фильтр по категории (Objects, Scripts, Rooms, Sprites, etc.)",
+                    "enum": ["Objects", "Scripts", "Rooms", "Sprites", "Notes", "Tile Sets", "Timelines", "Fonts", "Sounds", "Extensions"]
+                }
+            },
+            "required": []
+        }
+    )
+]
+
 
 class GMS2MCPServer:
     """MCP Сервер для работы с GameMaker Studio 2"""
-    
+
+    # Максимум закэшированных парсеров (по одному на проект)
+    PARSER_CACHE_SIZE = 8
+
+    # Максимум закэшированных результатов scan_project
+    SCAN_CACHE_SIZE = 16
+
+    # Максимум закэшированных ответов про комнаты/объекты/спрайты
+    ASSET_CACHE_SIZE = 128
+
+    # Размер пула потоков для блокирующего файлового ввода-вывода
+    IO_WORKERS = 4
+
+    # Лимит одновременных блокирующих операций (защита от исчерпания fd)
+    IO_SEMAPHORE_LIMIT = 64
+
     def __init__(self, project_path: Optional[str] = None):
         self.project_path = project_path
         self.parser = None
+        # Текущая директория процесса не меняется — кэшируем один раз
+        self._cwd_abs = os.path.abspath(os.getcwd())
+        # Префикс папки MCP сервера: абсолютные пути вне её точно не корень сервера
+        self._mcp_root_prefix = os.path.abspath(os.path.dirname(__file__)) + os.sep
+        # Кэш парсеров: realpath проекта -> (парсер, mtime .yyp файла)
+        self._parser_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # Кэш результатов scan_project: (realpath, mtime .yyp) -> структура проекта
+        self._scan_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        # Кэш ответов про ассеты: (realpath, тип, имя, mtime) -> результат
+        self._asset_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        # Замки на путь проекта: одновременные холодные запросы строят парсер один раз
+        self._parser_locks: Dict[str, asyncio.Lock] = {}
+        # Пул потоков для блокирующих вызовов парсера, чтобы не блокировать event loop
+        self._exec = concurrent.futures.ThreadPoolExecutor(max_workers=self.IO_WORKERS)
+        self._fd_sem = asyncio.BoundedSemaphore(self.IO_SEMAPHORE_LIMIT)
         if project_path:
             self.parser = GMS2ProjectParser(project_path)
-        print(f"DEBUG: GMS2MCPServer initialized with project_path: {project_path}")
-    
+            # Затравливаем кэш парсером по умолчанию, чтобы первый запрос
+            # к сконфигурированному проекту не строил второй экземпляр
+            key = os.path.realpath(project_path)
+            self._parser_cache[key] = (self.parser, self._get_yyp_mtime(key))
+        # Таблица диспетчеризации инструментов: имя -> обработчик
+        self._dispatch = {
+            "scan_gms2_project": self._scan_project,
+            "get_gml_file_content": self._get_gml_content,
+            "get_room_info": self._get_room_info,
+            "get_object_info": self._get_object_info,
+            "get_sprite_info": self._get_sprite_info,
+            "export_project_data": self._export_project_data,
+            "list_project_assets": self._list_project_assets
+        }
+        logger.debug("GMS2MCPServer initialized with project_path: %s", project_path)
+
+    @staticmethod
+    def _get_yyp_mtime(project_path: str) -> float:
+        """Возвращает mtime .yyp файла проекта (0.0, если файла нет)"""
+        try:
+            mtimes = [
+                os.path.getmtime(os.path.join(project_path, f))
+                for f in os.listdir(project_path) if f.endswith('.yyp')
+            ]
+        except OSError:
+            return 0.0
+        return max(mtimes, default=0.0)
+
+    def _get_parser(self, project_path: str) -> GMS2ProjectParser:
+        """Возвращает кэшированный парсер для пути проекта
+
+        Кэш ключуется по нормализованному пути и инвалидируется,
+        когда меняется mtime .yyp файла проекта.
+        """
+        key = os.path.realpath(project_path)
+        yyp_mtime = self._get_yyp_mtime(key)
+        cached = self._parser_cache.get(key)
+        if cached is not None:
+            parser, cached_mtime = cached
+            if cached_mtime == yyp_mtime:
+                self._parser_cache.move_to_end(key)
+                return parser
+            del self._parser_cache[key]
+        parser = GMS2ProjectParser(project_path)
+        self._parser_cache[key] = (parser, yyp_mtime)
+        if len(self._parser_cache) > self.PARSER_CACHE_SIZE:
+            self._parser_cache.popitem(last=False)
+        return parser
+
+    @staticmethod
+    def _asset_mtime(project_path: str, folder: str, name: str) -> float:
+        """Возвращает mtime ассета (его .yy файла или папки), 0.0 если нет"""
+        asset_dir = os.path.join(project_path, folder, name)
+        yy_path = os.path.join(asset_dir, f"{name}.yy")
+        mtime = 0.0
+        for path in (yy_path, asset_dir):
+            try:
+                mtime = max(mtime, os.path.getmtime(path))
+            except OSError:
+                pass
+        return mtime
+
+    def _cached_asset(self, kind: str, folder: str, project_path: str,
+                      name: str, fetch_fn) -> Dict[str, Any]:
+        """Возвращает информацию об ассете, кэшируя её по mtime
+
+        Повторные запросы той же комнаты/объекта/спрайта не перечитывают
+        и не парсят .yy файл, пока ассет не изменился на диске.
+        """
+        key = (os.path.realpath(project_path), kind, name,
+               self._asset_mtime(project_path, folder, name))
+        cached = self._asset_cache.get(key)
+        if cached is not None:
+            self._asset_cache.move_to_end(key)
+            return cached
+        result = fetch_fn()
+        if "error" not in result:
+            self._asset_cache[key] = result
+            if len(self._asset_cache) > self.ASSET_CACHE_SIZE:
+                self._asset_cache.popitem(last=False)
+        return result
+
+    async def _run_blocking(self, func, *args):
+        """Выполняет блокирующий вызов парсера в пуле потоков
+
+        Семафор ограничивает число одновременных операций, чтобы не
+        исчерпать файловые дескрипторы при параллельных запросах.
+        """
+        async with self._fd_sem:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._exec, func, *args)
+
+    async def _get_parser_async(self, project_path: str) -> GMS2ProjectParser:
+        """Асинхронный доступ к кэшу парсеров с защитой от thundering herd
+
+        Несколько одновременных запросов к ещё не виденному проекту
+        строят парсер один раз: остальные ждут на замке и получают
+        уже закэшированный экземпляр.
+        """
+        key = os.path.realpath(project_path)
+        lock = self._parser_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            return await self._run_blocking(self._get_parser, project_path)
+
+    def _cached_scan(self, project_path: str,
+                     include: Optional[frozenset] = None) -> Dict[str, Any]:
+        """Возвращает результат scan_project, кэшируя его по mtime .yyp файла
+
+        Повторные запросы структуры проекта не перечитывают дерево файлов,
+        пока проект не изменился (не поменялся mtime .yyp файла).
+        include передаётся в scan_project для частичного сканирования.
+        """
+        real = os.path.realpath(project_path)
+        # mtime корня проекта ловит добавление/удаление папок верхнего
+        # уровня, которое не трогает .yyp файл
+        try:
+            root_mtime = os.stat(real).st_mtime
+        except OSError:
+            root_mtime = 0.0
+        key = (real, self._get_yyp_mtime(real), root_mtime, include)
+        cached = self._scan_cache.get(key)
+        if cached is not None:
+            self._scan_cache.move_to_end(key)
+            return cached
+        result = self._get_parser(project_path).scan_project(include)
+        if "error" not in result:
+            self._scan_cache[key] = result
+            if len(self._scan_cache) > self.SCAN_CACHE_SIZE:
+                self._scan_cache.popitem(last=False)
+        return result
+
     def _get_project_path(self, arguments: Dict[str, Any]) -> str:
         """Получает правильный путь к проекту из аргументов или config.env"""
         provided_path = arguments.get("project_path")
-        
+
+        # Быстрый путь: абсолютный путь вне папки сервера и не равный
+        # текущей директории (рабочей папке клиента) заведомо корректен,
+        # abspath/getcwd для него не нужны — оба префикса уже закэшированы
+        if provided_path and os.path.isabs(provided_path) \
+                and not provided_path.startswith(self._mcp_root_prefix) \
+                and os.path.normpath(provided_path) != self._cwd_abs:
+            return provided_path
+
         # Если путь не передан, используем из config.env
         if not provided_path:
             if self.project_path:
                 return self.project_path
-            else:
-                # Попытаемся загрузить из config.env напрямую
-                config_file = os.path.join(os.path.dirname(__file__), 'config.env')
-                print(f"DEBUG: Looking for config.env at: {config_file}")
-                load_dotenv(config_file)
-                config_path = os.getenv('GMS2_PROJECT_PATH')
-                if config_path:
-                    print(f"DEBUG: Loading project path from config.env: {config_path}")
-                    return config_path
-                else:
-                    raise ValueError(f"Project path not configured in config.env and not provided. Current self.project_path: {self.project_path}, config_file: {config_file}")
-        
+            # config.env уже загружен один раз при старте
+            config_path = _get_config()['GMS2_PROJECT_PATH']
+            if config_path:
+                logger.debug("Loading project path from config.env: %s", config_path)
+                return config_path
+            raise ValueError(f"Project path not configured in config.env and not provided. Current self.project_path: {self.project_path}")
+
         # Проверяем, не является ли переданный путь корнем MCP сервера
-        current_dir = os.getcwd()
-        if os.path.abspath(provided_path) == os.path.abspath(current_dir):
+        if os.path.abspath(provided_path) == self._cwd_abs:
             if self.project_path:
                 return self.project_path
-            else:
-                # Попытаемся загрузить из config.env напрямую
-                config_file = os.path.join(os.path.dirname(__file__), 'config.env')
-                print(f"DEBUG: Looking for config.env at: {config_file}")
-                load_dotenv(config_file)
-                config_path = os.getenv('GMS2_PROJECT_PATH')
-                if config_path:
-                    print(f"DEBUG: Loading project path from config.env: {config_path}")
-                    return config_path
-                else:
-                    raise ValueError(f"Provided path is MCP server root, but project path not configured in config.env. Current self.project_path: {self.project_path}, config_file: {config_file}")
-        
+            config_path = _get_config()['GMS2_PROJECT_PATH']
+            if config_path:
+                logger.debug("Loading project path from config.env: %s", config_path)
+                return config_path
+            raise ValueError(f"Provided path is MCP server root, but project path not configured in config.env. Current self.project_path: {self.project_path}")
+
         # Если передан другой путь, используем его
         return provided_path
     
     def get_tools(self) -> List[Tool]:
         """Возвращает список доступных инструментов"""
-        return [
-            Tool(
-                name="scan_gms2_project",
-                description="Сканирует проект GameMaker Studio 2 и возвращает структуру файлов",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project_path": {
-                            "type": "string",
-                            "description": "Путь к папке проекта GMS2 (необязательно, используется из config.env)"
-                        }
-                    },
-                    "required": []
-                }
-            ),
-            Tool(
-                name="get_gml_file_content",
-                description="Получает содержимое конкретного GML файла",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project_path": {
-                            "type": "string",
-                            "description": "Путь к папке проекта GMS2 (необязательно, используется из config.env)"
-                        },
-                        "file_path": {
-                            "type": "string",
-                            "description": "Путь к GML файлу (относительный или абсолютный)"
-                        }
-                    },
-                    "required": ["file_path"]
-                }
-            ),
-            Tool(
-                name="get_room_info",
-                description="Получает детальную информацию о комнате из .yy файла",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project_path": {
-                            "type": "string",
-                            "description": "Путь к папке проекта GMS2 (необязательно, используется из config.env)"
-                        },
-                        "room_name": {
-                            "type": "string",
-                            "description": "Имя комнаты"
-                        }
-                    },
-                    "required": ["room_name"]
-                }
-            ),
-            Tool(
-                name="get_object_info",
-                description="Получает детальную информацию об объекте из .yy файла",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project_path": {
-                            "type": "string",
-                            "description": "Путь к папке проекта GMS2 (необязательно, используется из config.env)"
-                        },
-                        "object_name": {
-                            "type": "string",
-                            "description": "Имя объекта"
-                        }
-                    },
-                    "required": ["object_name"]
-                }
-            ),
-            Tool(
-                name="get_sprite_info",
-                description="Получает информацию о спрайте",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project_path": {
-                            "type": "string",
-                            "description": "Путь к папке проекта GMS2 (необязательно, используется из config.env)"
-                        },
-                        "sprite_name": {
-                            "type": "string",
-                            "description": "Имя спрайта"
-                        }
-                    },
-                    "required": ["sprite_name"]
-                }
-            ),
-            Tool(
-                name="export_project_data",
-                description="Экспортирует все данные проекта в текстовый формат (аналог функции из vibe2gml)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project_path": {
-                            "type": "string",
-                            "description": "Путь к папке проекта GMS2 (необязательно, используется из config.env)"
-                        },
-                        "save_to_file": {
-                            "type": "boolean",
-                            "description": "Сохранить результат в файл (по умолчанию false)",
-                            "default": False
-                        },
-                        "output_file": {
-                            "type": "string",
-                            "description": "Путь для сохранения файла (если save_to_file=true)"
-                        }
-                    },
-                    "required": []
-                }
-            ),
-            Tool(
-                name="list_project_assets",
-                description="Получает список всех ассетов проекта по категориям",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project_path": {
-                            "type": "string",
-                            "description": "Путь к папке проекта GMS2 (необязательно, используется из config.env)"
-                        },
-                        "category": {
-                            "type": "string",
-                            "description": "Фильтр по категории (Objects, Scripts, Rooms, Sprites, etc.)",
-                            "enum": ["Objects", "Scripts", "Rooms", "Sprites", "Notes", "Tile Sets", "Timelines", "Fonts", "Sounds", "Extensions"]
-                        }
-                    },
-                    "required": []
-                }
-            )
-        ]
+        return _TOOLS
     
     async def handle_tool_call(self, name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-        """Обрабатывает вызовы инструментов"""
+        """Обрабатывает вызовы инструментов
+
+        Разрешение пути проекта и оформление ошибок общие для всех
+        инструментов и выполняются здесь один раз, а не в каждом
+        обработчике.
+        """
         try:
-            if name == "scan_gms2_project":
-                return await self._scan_project(arguments)
-            elif name == "get_gml_file_content":
-                return await self._get_gml_content(arguments)
-            elif name == "get_room_info":
-                return await self._get_room_info(arguments)
-            elif name == "get_object_info":
-                return await self._get_object_info(arguments)
-            elif name == "get_sprite_info":
-                return await self._get_sprite_info(arguments)
-            elif name == "export_project_data":
-                return await self._export_project_data(arguments)
-            elif name == "list_project_assets":
-                return await self._list_project_assets(arguments)
-            else:
-                return [TextContent(type="text", text=f"Unknown tool: {name}")]
+            handler = self._dispatch.get(name)
+            if handler is None:
+                return [_tc(f"Unknown tool: {name}")]
+            try:
+                project_path = self._get_project_path(arguments)
+            except ValueError as e:
+                return [_tc(f"Error: {str(e)}")]
+            return await handler(project_path, arguments)
         except Exception as e:
-            return [TextContent(type="text", text=f"Error executing tool {name}: {str(e)}")]
+            return [_tc(f"Error executing tool {name}: {str(e)}")]
     
-    async def _scan_project(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _scan_project(self, project_path: str, arguments: Dict[str, Any]) -> List[TextContent]:
         """Сканирует проект GMS2"""
-        try:
-            project_path = self._get_project_path(arguments)
-        except ValueError as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
-        
-        parser = GMS2ProjectParser(project_path)
-        result = parser.scan_project()
-        
+        result = await self._run_blocking(self._cached_scan, project_path)
+
         if "error" in result:
-            return [TextContent(type="text", text=f"Error: {result['error']}")]
-        
+            return [_tc(f"Error: {result['error']}")]
+
         # Форматируем результат для удобного чтения
-        output = []
-        output.append(f"GameMaker Studio 2 Project: {result['project_name']}")
-        output.append(f"Path: {result['project_path']}")
-        output.append(f"Total GML Files: {result['total_gml_files']}")
-        output.append("")
-        
+        buf = io.StringIO()
+        w = buf.write
+        w(f"GameMaker Studio 2 Project: {result['project_name']}\n")
+        w(f"Path: {result['project_path']}\n")
+        w(f"Total GML Files: {result['total_gml_files']}\n")
+        w("\n")
+
         # Показываем структуру по категориям
         for category, info in result['categories'].items():
             if info['assets']:
-                output.append(f"{category}: {len(info['assets'])} assets")
-                for asset in info['assets']:
-                    gml_count = len(asset['gml_files'])
-                    yy_status = "✓" if asset['yy_file'] else "✗"
-                    output.append(f"  - {asset['name']} (GML: {gml_count}, YY: {yy_status})")
-        
-        output.append("")
-        output.append("Recent GML Files:")
-        for i, (display_name, _, relative_path, _) in enumerate(result['gml_files'][:10]):
-            output.append(f"  {i+1}. {display_name} ({relative_path})")
-        
+                w(f"{category}: {len(info['assets'])} assets\n")
+                for name, gml_count, has_yy in zip(info['names'], info['gml_counts'], info['yy_flags']):
+                    w(f"  - {name} (GML: {gml_count}, YY: {'✓' if has_yy else '✗'})\n")
+
+        w("\n")
+        w("Recent GML Files:\n")
+        for i, entry in enumerate(result['gml_files'][:10]):
+            w(f"  {i+1}. {entry.display_name} ({entry.relative_path})\n")
+
         if len(result['gml_files']) > 10:
-            output.append(f"  ... and {len(result['gml_files']) - 10} more files")
-        
-        return [TextContent(type="text", text="\n".join(output))]
+            w(f"  ... and {len(result['gml_files']) - 10} more files\n")
+
+        return [_tc(buf.getvalue())]
     
-    async def _get_gml_content(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _get_gml_content(self, project_path: str, arguments: Dict[str, Any]) -> List[TextContent]:
         """Получает содержимое GML файла"""
-        try:
-            project_path = self._get_project_path(arguments)
-        except ValueError as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
-            
         file_path = arguments.get("file_path")
         if not file_path:
-            return [TextContent(type="text", text="Error: file_path is required")]
+            return [_tc("Error: file_path is required")]
         
-        parser = GMS2ProjectParser(project_path)
-        
-        # Если путь относительный, делаем его абсолютным
-        if not os.path.isabs(file_path):
-            file_path = os.path.join(project_path, file_path)
-        
-        result = parser.get_gml_content(file_path)
+        parser = await self._get_parser_async(project_path)
+
+        # Если путь относительный, делаем его абсолютным (кэшируется)
+        file_path = _resolve_gml_path(project_path, file_path)
+
+        result = await self._run_blocking(parser.get_gml_content, file_path)
         
         if "error" in result:
-            return [TextContent(type="text", text=f"Error: {result['error']}")]
+            return [_tc(f"Error: {result['error']}")]
         
         output = []
         output.append(f"GML File: {result['relative_path']}")
@@ -292,194 +464,195 @@ class GMS2MCPServer:
         output.append("-" * 50)
         output.append(result['content'])
         
-        return [TextContent(type="text", text="\n".join(output))]
+        return [_tc("\n".join(output))]
     
-    async def _get_room_info(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _get_room_info(self, project_path: str, arguments: Dict[str, Any]) -> List[TextContent]:
         """Получает информацию о комнате"""
-        try:
-            project_path = self._get_project_path(arguments)
-        except ValueError as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
-            
         room_name = arguments.get("room_name")
         if not room_name:
-            return [TextContent(type="text", text="Error: room_name is required")]
+            return [_tc("Error: room_name is required")]
         
-        parser = GMS2ProjectParser(project_path)
-        result = parser.get_room_info(room_name)
+        parser = await self._get_parser_async(project_path)
+        result = await self._run_blocking(
+            self._cached_asset, "room", "rooms", project_path, room_name,
+            lambda: parser.get_room_info(room_name))
         
         if "error" in result:
-            return [TextContent(type="text", text=f"Error: {result['error']}")]
-        
-        output = []
-        output.append(f"Room Information: {result['room_name']}")
-        output.append("=" * 50)
-        output.append("")
-        output.append("Formatted View:")
-        output.append(result['formatted_info'])
-        output.append("")
-        output.append("Raw Data Available:")
-        output.append(f"- YY File: {result['yy_path']}")
-        output.append(f"- Layers: {len(result['data'].get('layers', []))}")
-        output.append(f"- Room Settings: {'Yes' if result['data'].get('roomSettings') else 'No'}")
-        
-        return [TextContent(type="text", text="\n".join(output))]
+            return [_tc(f"Error: {result['error']}")]
+        
+        buf = io.StringIO()
+        w = buf.write
+        w(f"Room Information: {result['room_name']}\n")
+        w("=" * 50 + "\n")
+        w("\n")
+        w("Formatted View:\n")
+        w(result['formatted_info'] + "\n")
+        w("\n")
+        w("Raw Data Available:\n")
+        w(f"- YY File: {result['yy_path']}\n")
+        w(f"- Layers: {len(result['data'].get('layers', []))}\n")
+        w(f"- Room Settings: {'Yes' if result['data'].get('roomSettings') else 'No'}\n")
+
+        return [_tc(buf.getvalue())]
     
-    async def _get_object_info(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _get_object_info(self, project_path: str, arguments: Dict[str, Any]) -> List[TextContent]:
         """Получает информацию об объекте"""
-        try:
-            project_path = self._get_project_path(arguments)
-        except ValueError as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
-            
         object_name = arguments.get("object_name")
         if not object_name:
-            return [TextContent(type="text", text="Error: object_name is required")]
+            return [_tc("Error: object_name is required")]
         
-        parser = GMS2ProjectParser(project_path)
-        result = parser.get_object_info(object_name)
+        parser = await self._get_parser_async(project_path)
+        result = await self._run_blocking(
+            self._cached_asset, "object", "objects", project_path, object_name,
+            lambda: parser.get_object_info(object_name))
         
         if "error" in result:
-            return [TextContent(type="text", text=f"Error: {result['error']}")]
-        
-        output = []
-        output.append(f"Object Information: {result['object_name']}")
-        output.append("=" * 50)
-        output.append("")
-        output.append("Formatted View:")
-        output.append(result['formatted_info'])
-        output.append("")
-        output.append("Raw Data Available:")
-        output.append(f"- YY File: {result['yy_path']}")
-        output.append(f"- Events: {len(result['data'].get('eventList', []))}")
-        output.append(f"- Physics: {'Enabled' if result['data'].get('physicsObject') else 'Disabled'}")
-        
-        return [TextContent(type="text", text="\n".join(output))]
+            return [_tc(f"Error: {result['error']}")]
+        
+        buf = io.StringIO()
+        w = buf.write
+        w(f"Object Information: {result['object_name']}\n")
+        w("=" * 50 + "\n")
+        w("\n")
+        w("Formatted View:\n")
+        w(result['formatted_info'] + "\n")
+        w("\n")
+        w("Raw Data Available:\n")
+        w(f"- YY File: {result['yy_path']}\n")
+        w(f"- Events: {len(result['data'].get('eventList', []))}\n")
+        w(f"- Physics: {'Enabled' if result['data'].get('physicsObject') else 'Disabled'}\n")
+
+        return [_tc(buf.getvalue())]
     
-    async def _get_sprite_info(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _get_sprite_info(self, project_path: str, arguments: Dict[str, Any]) -> List[TextContent]:
         """Получает информацию о спрайте"""
-        try:
-            project_path = self._get_project_path(arguments)
-        except ValueError as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
-            
         sprite_name = arguments.get("sprite_name")
         if not sprite_name:
-            return [TextContent(type="text", text="Error: sprite_name is required")]
+            return [_tc("Error: sprite_name is required")]
         
-        parser = GMS2ProjectParser(project_path)
-        result = parser.get_sprite_info(sprite_name)
+        parser = await self._get_parser_async(project_path)
+        result = await self._run_blocking(
+            self._cached_asset, "sprite", "sprites", project_path, sprite_name,
+            lambda: parser.get_sprite_info(sprite_name))
         
         if "error" in result:
-            return [TextContent(type="text", text=f"Error: {result['error']}")]
-        
-        output = []
-        output.append(f"Sprite Information: {result['sprite_name']}")
-        output.append("=" * 50)
-        output.append("")
-        output.append(f"Sprite Path: {result['sprite_path']}")
-        output.append(f"YY File: {'Yes' if result['yy_path'] else 'No'}")
-        output.append(f"Frame Count: {len(result['frames'])}")
-        
+            return [_tc(f"Error: {result['error']}")]
+        
+        buf = io.StringIO()
+        w = buf.write
+        w(f"Sprite Information: {result['sprite_name']}\n")
+        w("=" * 50 + "\n")
+        w("\n")
+        w(f"Sprite Path: {result['sprite_path']}\n")
+        w(f"YY File: {'Yes' if result['yy_path'] else 'No'}\n")
+        w(f"Frame Count: {len(result['frames'])}\n")
+
         if result['frames']:
-            output.append("")
-            output.append("Frames:")
+            w("\n")
+            w("Frames:\n")
             for i, frame in enumerate(result['frames']):
-                output.append(f"  {i+1}. {frame['filename']}")
-        
-        return [TextContent(type="text", text="\n".join(output))]
+                w(f"  {i+1}. {frame['filename']}\n")
+
+        return [_tc(buf.getvalue())]
     
-    async def _export_project_data(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _export_project_data(self, project_path: str, arguments: Dict[str, Any]) -> List[TextContent]:
         """Экспортирует все данные проекта"""
-        try:
-            project_path = self._get_project_path(arguments)
-        except ValueError as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
-            
         save_to_file = arguments.get("save_to_file", False)
         output_file = arguments.get("output_file")
-        
-        parser = GMS2ProjectParser(project_path)
-        export_data = parser.export_all_data()
-        
+
+        parser = await self._get_parser_async(project_path)
+
         if save_to_file:
             if not output_file:
                 # Генерируем имя файла по умолчанию
                 project_name = os.path.basename(project_path)
                 output_file = f"{project_name}_export.txt"
-            
+
+            # Пишем экспорт в файл потоково, не собирая весь текст в памяти.
+            # Бинарный режим с большим буфером: кодируем каждый чанк один раз
+            # и избегаем лишних syscall'ов на многомегабайтных экспортах.
+            def _write_export() -> int:
+                total = 0
+                with open(output_file, 'wb', buffering=1 << 20) as f:
+                    for chunk in parser.iter_export_chunks():
+                        data = chunk.encode('utf-8')
+                        f.write(data)
+                        total += len(data)
+                return total
+
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(export_data)
-                
-                return [TextContent(type="text", text=f"Project data exported to: {output_file}\n\nFile size: {len(export_data)} characters")]
+                total_bytes = await self._run_blocking(_write_export)
+                return [_tc(f"Project data exported to: {output_file}\n\nFile size: {total_bytes} bytes")]
             except Exception as e:
-                return [TextContent(type="text", text=f"Error saving file: {str(e)}\n\nExport data:\n{export_data}")]
+                return [_tc(f"Error saving file: {str(e)}")]
         else:
             # Возвращаем данные напрямую
-            return [TextContent(type="text", text=export_data)]
+            export_data = await self._run_blocking(parser.export_all_data)
+            return [_tc(export_data)]
     
-    async def _list_project_assets(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _list_project_assets(self, project_path: str, arguments: Dict[str, Any]) -> List[TextContent]:
         """Список ассетов проекта"""
-        try:
-            project_path = self._get_project_path(arguments)
-        except ValueError as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
-            
         category_filter = arguments.get("category")
-        
-        parser = GMS2ProjectParser(project_path)
-        result = parser.scan_project()
-        
+
+        # При фильтре по категории сканируем только её подпапку
+        include = frozenset({category_filter}) if category_filter else None
+        result = await self._run_blocking(self._cached_scan, project_path, include)
+
         if "error" in result:
-            return [TextContent(type="text", text=f"Error: {result['error']}")]
-        
-        output = []
-        output.append(f"Assets in {result['project_name']}:")
-        output.append("=" * 50)
-        
-        categories_to_show = [category_filter] if category_filter else result['categories'].keys()
-        
-        for category in categories_to_show:
-            if category in result['categories']:
-                info = result['categories'][category]
-                if info['assets']:
-                    output.append(f"\n{category} ({len(info['assets'])} items):")
-                    for asset in info['assets']:
-                        gml_files = len(asset['gml_files'])
-                        yy_file = "✓" if asset['yy_file'] else "✗"
-                        output.append(f"  - {asset['name']} (GML: {gml_files}, YY: {yy_file})")
-                        
-                        # Показываем GML файлы если их немного
-                        if gml_files > 0 and gml_files <= 5:
-                            for gml in asset['gml_files']:
-                                output.append(f"    • {gml['name']}")
+            return [_tc(f"Error: {result['error']}")]
         
-        return [TextContent(type="text", text="\n".join(output))]
+        buf = io.StringIO()
+        w = buf.write
+        w(f"Assets in {result['project_name']}:\n")
+        w("=" * 50 + "\n")
+
+        # Фильтруем категории один раз, без проверки in на каждой итерации
+        if category_filter:
+            categories = {category_filter: result['categories'][category_filter]} \
+                if category_filter in result['categories'] else {}
+        else:
+            categories = result['categories']
+
+        for category, info in categories.items():
+            if info['assets']:
+                w(f"\n{category} ({len(info['assets'])} items):\n")
+                for asset, name, gml_files, has_yy in zip(
+                        info['assets'], info['names'], info['gml_counts'], info['yy_flags']):
+                    w(f"  - {name} (GML: {gml_files}, YY: {'✓' if has_yy else '✗'})\n")
+
+                    # Показываем GML файлы если их немного
+                    if gml_files > 0 and gml_files <= 5:
+                        for gml in asset['gml_files']:
+                            w(f"    • {gml['name']}\n")
+
+        return [_tc(buf.getvalue())]
 
 
 async def main():
     """Главная функция запуска сервера"""
-    # Загружаем переменные окружения из config.env
-    config_file = os.path.join(os.path.dirname(__file__), 'config.env')
-    load_dotenv(config_file)
-    
+    # Конфигурация из config.env (загружается один раз на процесс)
+    config = _get_config()
+
     parser = argparse.ArgumentParser(description="GameMaker Studio 2 MCP Server")
     parser.add_argument("--project-path", type=str, help="Path to GMS2 project (overrides config.env)")
     args = parser.parse_args()
-    
+
     # Определяем путь к проекту: командная строка > config.env > None
-    project_path = args.project_path or os.getenv('GMS2_PROJECT_PATH')
-    
-    if project_path and not os.path.exists(project_path):
-        print(f"Warning: Project path does not exist: {project_path}")
+    project_path = args.project_path or config['GMS2_PROJECT_PATH']
     
+    if project_path:
+        # os.stat вместо os.path.exists: один syscall и готовый результат
+        try:
+            os.stat(project_path)
+        except OSError:
+            logger.warning("Project path does not exist: %s", project_path)
+
     # Создаем экземпляр сервера
     mcp_server = GMS2MCPServer(project_path)
-    
+
     # Отладочная информация
     if project_path:
-        print(f"MCP Server initialized with project path: {project_path}")
+        logger.info("MCP Server initialized with project path: %s", project_path)
     
     # Создаем MCP Server
     server = Server("gms2-mcp-server")
@@ -501,7 +674,15 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        print("Starting MCP server...", file=sys.stderr)
+        logging.basicConfig(stream=sys.stderr, level=logging.INFO)
+        # uvloop (если установлен) ускоряет планирование корутин; не обязателен.
+        # Ставим до asyncio.run, чтобы цикл создался уже через его политику.
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+        logger.info("Starting MCP server...")
         asyncio.run(main())
     except Exception as e:
         print(f"Error starting MCP server: {e}", file=sys.stderr)